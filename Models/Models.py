@@ -1,26 +1,36 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, CheckConstraint, Column, DateTime, Field, Index, Relationship, UniqueConstraint, func
 from typing import Optional, List
-from datetime import date
+from datetime import date, datetime
 
 
 class Category(SQLModel, table=True):
     __tablename__: str = "categories"
+    __table_args__ = (
+        CheckConstraint("length(category_name) > 0",
+                        name="ck_category_name_nonempty"),
+    )
 
     category_id: Optional[int] = Field(default=None, primary_key=True)
     category_name: str
 
     products: List["Product"] = Relationship(
-        back_populates="category", cascade_delete=True)
+        back_populates="category", cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "raise"})
 
 
 class Brand(SQLModel, table=True):
     __tablename__: str = "brands"
+    __table_args__ = (
+        CheckConstraint("length(brand_name) > 0",
+                        name="ck_brand_name_nonempty"),
+    )
 
     brand_id: Optional[int] = Field(default=None, primary_key=True)
     brand_name: str
 
     products: List["Product"] = Relationship(
-        back_populates="brand", cascade_delete=True)
+        back_populates="brand", cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "raise"})
 
 
 class Platform(SQLModel, table=True):
@@ -30,53 +40,91 @@ class Platform(SQLModel, table=True):
     platform_name: str
 
     sales: List["Sale"] = Relationship(
-        back_populates="platform", cascade_delete=True)
+        back_populates="platform", cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "raise"})
     inventory: List["Inventory"] = Relationship(
-        back_populates="platform", cascade_delete=True)
+        back_populates="platform", cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "raise"})
 
 
 class Product(SQLModel, table=True):
     __tablename__: str = "products"
+    __table_args__ = (
+        Index("ix_products_cat_brand", "category_id", "brand_id"),
+        CheckConstraint("length(product_name) > 0",
+                        name="ck_product_name_nonempty"),
+    )
 
     product_id: Optional[int] = Field(default=None, primary_key=True)
     product_name: str
     category_id: Optional[int] = Field(
         default=None, foreign_key="categories.category_id", ondelete="CASCADE")
     brand_id: Optional[int] = Field(
-        default=None, foreign_key="brands.brand_id", ondelete="CASCADE")
+        default=None, foreign_key="brands.brand_id", ondelete="CASCADE",
+        index=True)
 
-    category: Optional[Category] = Relationship(back_populates="products")
-    brand: Optional[Brand] = Relationship(back_populates="products")
+    category: Optional[Category] = Relationship(
+        back_populates="products", sa_relationship_kwargs={"lazy": "raise"})
+    brand: Optional[Brand] = Relationship(
+        back_populates="products", sa_relationship_kwargs={"lazy": "raise"})
     sales: List["Sale"] = Relationship(
-        back_populates="product", cascade_delete=True)
+        back_populates="product", cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "raise"})
     inventory: List["Inventory"] = Relationship(
-        back_populates="product", cascade_delete=True)
+        back_populates="product", cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "raise"})
 
 
 class Sale(SQLModel, table=True):
     __tablename__: str = "sales"
+    # The composite index serves the combined sales filter and, via its
+    # prefix, the product-only lookups; platform and date keep their own
+    # indexes for standalone filters.
+    __table_args__ = (
+        Index("ix_sales_prod_plat_date",
+              "product_id", "platform_id", "sale_date"),
+    )
 
     sale_id: Optional[int] = Field(default=None, primary_key=True)
     product_id: int = Field(
         foreign_key="products.product_id", ondelete="CASCADE")
     platform_id: int = Field(
-        foreign_key="platforms.platform_id", ondelete="CASCADE")
-    sale_date: date
+        foreign_key="platforms.platform_id", ondelete="CASCADE", index=True)
+    sale_date: date = Field(index=True)
     quantity_sold: int
     sale_price: float
 
-    product: Optional[Product] = Relationship(back_populates="sales")
-    platform: Optional[Platform] = Relationship(back_populates="sales")
+    product: Optional[Product] = Relationship(
+        back_populates="sales", sa_relationship_kwargs={"lazy": "raise"})
+    platform: Optional[Platform] = Relationship(
+        back_populates="sales", sa_relationship_kwargs={"lazy": "raise"})
 
 
 class Inventory(SQLModel, table=True):
+    # The unique constraint doubles as the index for the
+    # (product_id, platform_id) lookups and guarantees a single inventory
+    # row per product/platform pair.
+    __table_args__ = (
+        UniqueConstraint("product_id", "platform_id",
+                         name="uq_inv_prod_plat"),
+        CheckConstraint("stock_quantity >= 0", name="ck_inv_qty_nonneg"),
+        Index("ix_inv_stock", "stock_quantity"),
+    )
+
     inventory_id: Optional[int] = Field(default=None, primary_key=True)
     product_id: int = Field(
         foreign_key="products.product_id", ondelete="CASCADE")
     platform_id: int = Field(
-        foreign_key="platforms.platform_id", ondelete="CASCADE")
+        foreign_key="platforms.platform_id", ondelete="CASCADE", index=True)
     stock_quantity: int
-    last_updated: date
-
-    product: Optional[Product] = Relationship(back_populates="inventory")
-    platform: Optional[Platform] = Relationship(back_populates="inventory")
+    # Stamped by the database on insert and update, so handlers don't need
+    # to take a wall-clock reading per request.
+    last_updated: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime, server_default=func.now(),
+                         onupdate=func.now()))
+
+    product: Optional[Product] = Relationship(
+        back_populates="inventory", sa_relationship_kwargs={"lazy": "raise"})
+    platform: Optional[Platform] = Relationship(
+        back_populates="inventory", sa_relationship_kwargs={"lazy": "raise"})
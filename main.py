@@ -1,36 +1,233 @@
+import asyncio
+import os
 from contextlib import asynccontextmanager
-from datetime import datetime
 from typing import Annotated, Union
-from fastapi import Depends, FastAPI, HTTPException, Query
-from sqlmodel import SQLModel, Session, col, create_engine, func, select
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, bindparam, col, exists, func, insert, select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from Models.Models import *
 from Models.ApiModels import BrandDataModel, CategoryDataModel, InvDeleteModel, InvListModel, InvUpdateModel, ProductInsertModel, ProductListModel, ProductUpdateModel, SalesDataModel, SalesListModel
 
-sqlite_file_name = "database.db"
-sqlite_url = f"sqlite:///{sqlite_file_name}"
+# SQLITE_PATH may be a plain file path or a file: URI, e.g.
+# file:/dev/shm/api.db?cache=shared to run tests and benchmarks against a
+# tmpfs database with no fsync cost. Production keeps the on-disk default.
+sqlite_file_name = os.getenv("SQLITE_PATH", "database.db")
+sqlite_url = f"sqlite+aiosqlite:///{sqlite_file_name}"
+if sqlite_file_name.startswith("file:"):
+    sqlite_url += "&uri=true" if "?" in sqlite_file_name else "?uri=true"
 
 connect_args = {"check_same_thread": False}
-engine = create_engine(sqlite_url, connect_args=connect_args)
+# Under WAL one writer and several readers is SQLite's sweet spot: keep a
+# steady pool sized for the readers with a small burst overflow, rather
+# than a large overflow of short-lived connections that each repay the
+# connect-time PRAGMA setup.
+engine = create_async_engine(sqlite_url, connect_args=connect_args,
+                             pool_size=8, max_overflow=4)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run concurrently with a writer, and synchronous=NORMAL
+    # replaces the fsync on every commit with periodic ones.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # Checkpointing is handled by the background task in lifespan() so a
+    # commit never stalls a request while the WAL is folded back.
+    cursor.execute("PRAGMA wal_autocheckpoint=0")
+    cursor.close()
+
+
+# Full-text index over product names; kept in sync with the products table
+# by triggers so get_prod can use an inverted-index MATCH instead of a
+# LIKE '%...%' table scan.
+_PRODUCT_FTS_DDL = [
+    """CREATE VIRTUAL TABLE product_fts USING fts5(
+           product_name, content='products', content_rowid='product_id')""",
+    """CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN
+           INSERT INTO product_fts(rowid, product_name)
+           VALUES (new.product_id, new.product_name);
+       END""",
+    """CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN
+           INSERT INTO product_fts(product_fts, rowid, product_name)
+           VALUES ('delete', old.product_id, old.product_name);
+       END""",
+    """CREATE TRIGGER products_fts_au AFTER UPDATE ON products BEGIN
+           INSERT INTO product_fts(product_fts, rowid, product_name)
+           VALUES ('delete', old.product_id, old.product_name);
+           INSERT INTO product_fts(rowid, product_name)
+           VALUES (new.product_id, new.product_name);
+       END""",
+]
+
+
+def _create_missing_indexes(sync_conn):
+    # create_all skips tables that already exist, so databases created
+    # before the model indexes were declared never get them. Re-emit every
+    # declared index with a checkfirst so legacy files catch up.
+    for table in SQLModel.metadata.tables.values():
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+async def create_db_and_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+
+        # The upsert in update_inv needs the unique (product_id, platform_id)
+        # constraint, which on legacy databases exists neither as a table
+        # constraint (matched via the CREATE TABLE sql) nor as an index.
+        # Collapse any duplicate pairs to the newest row, then add it as a
+        # unique index, which ON CONFLICT targets just as well.
+        has_uq = await conn.scalar(text(
+            """SELECT count(*) FROM sqlite_master
+               WHERE name = 'uq_inv_prod_plat'
+                  OR sql LIKE '%uq_inv_prod_plat%'"""))
+        if not has_uq:
+            await conn.execute(text(
+                """DELETE FROM inventory WHERE inventory_id NOT IN (
+                       SELECT max(inventory_id) FROM inventory
+                       GROUP BY product_id, platform_id)"""))
+            await conn.execute(text(
+                """CREATE UNIQUE INDEX uq_inv_prod_plat
+                   ON inventory (product_id, platform_id)"""))
+
+        has_fts = await conn.scalar(text(
+            "SELECT count(*) FROM sqlite_master WHERE name = 'product_fts'"))
+        if not has_fts:
+            for ddl in _PRODUCT_FTS_DDL:
+                await conn.execute(text(ddl))
+            # Index any products that predate the FTS table.
+            await conn.execute(text(
+                "INSERT INTO product_fts(product_fts) VALUES('rebuild')"))
+
+
+async def get_session():
+    # expire_on_commit=False keeps attributes readable after commit without
+    # the extra SELECT that session.refresh() would issue.
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
 
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+
+# SQLite allows a single writer at a time; taking this lock around every
+# write keeps concurrent mutating requests queued in-process instead of
+# colliding on the database lock and burning the busy_timeout.
+write_lock = asyncio.Lock()
+
+
+# Statements for the hottest lookups are built once at import time so each
+# request reuses the cached compilation instead of rebuilding the expression
+# tree.
+_PRODUCT_EXISTS = select(exists()
+                         .where(Product.product_id == bindparam("product_id")))
+_INV_BY_PROD_PLAT = select(Inventory).where(
+    Inventory.product_id == bindparam("product_id"),
+    Inventory.platform_id == bindparam("platform_id"))
+
+
+# Category, Brand and Platform are tiny reference tables that rarely change,
+# so their id sets are kept in a short-lived in-process cache. Endpoints that
+# add or delete rows drop the matching entry; the TTL covers out-of-band
+# writers such as other workers.
+_ref_id_cache: TTLCache = TTLCache(maxsize=3, ttl=60)
+
+
+async def _ref_ids(session: AsyncSession, id_column) -> set:
+    key = id_column.key
+    ids = _ref_id_cache.get(key)
+    if ids is None:
+        ids = set((await session.exec(select(id_column))).all())
+        _ref_id_cache[key] = ids
+    return ids
+
+
+async def missing_ids(session: AsyncSession, id_column, ids: set) -> set:
+    # Batch counterpart of validate_ids: check a whole id set against one
+    # column with a single IN (...) query and return the ids that have no
+    # matching row. Meant for callers that validate many rows at once.
+    found = set((await session.exec(
+        select(id_column).where(id_column.in_(ids)))).all())
+    return set(ids) - found
+
+
+async def commit_or_422(session: AsyncSession) -> None:
+    # Value rules (non-negative stock, non-empty names) live in DB check
+    # constraints; surface a violation as a validation error.
+    try:
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        raise HTTPException(status_code=422, detail=str(e.orig))
+
+
+async def validate_ids(session: AsyncSession,
+                       product_id: Union[int, None] = None,
+                       platform_id: Union[int, None] = None,
+                       category_id: Union[int, None] = None,
+                       brand_id: Union[int, None] = None) -> None:
+    # Validate every provided id, raising Not Found for the first one that
+    # has no matching row. Products are checked against the database;
+    # the reference tables are served from the in-process cache.
+    if product_id is not None:
+        prod_exists = await session.scalar(
+            _PRODUCT_EXISTS, {"product_id": product_id})
+        if not prod_exists:
+            raise HTTPException(
+                status_code=404, detail="product_id is not valid.")
+
+    if platform_id is not None \
+            and platform_id not in await _ref_ids(session, Platform.platform_id):
+        raise HTTPException(
+            status_code=404, detail="platform_id is not valid.")
 
+    if category_id is not None \
+            and category_id not in await _ref_ids(session, Category.category_id):
+        raise HTTPException(
+            status_code=404, detail="category_id is not valid.")
 
-def get_session():
-    with Session(engine) as session:
-        yield session
+    if brand_id is not None \
+            and brand_id not in await _ref_ids(session, Brand.brand_id):
+        raise HTTPException(
+            status_code=404, detail="brand_id is not valid.")
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+async def _wal_checkpointer():
+    # With wal_autocheckpoint disabled, periodically fold the WAL back into
+    # the main database file off the request path.
+    while True:
+        await asyncio.sleep(30)
+        async with write_lock:
+            async with engine.connect() as conn:
+                await conn.execute(text("PRAGMA wal_checkpoint(PASSIVE)"))
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_db_and_tables()
+    await create_db_and_tables()
+
+    # Warm the reference-id cache so the first requests skip the load.
+    async with AsyncSession(engine) as session:
+        for id_column in (Platform.platform_id, Category.category_id,
+                          Brand.brand_id):
+            await _ref_ids(session, id_column)
+
+    checkpoint_task = asyncio.create_task(_wal_checkpointer())
     yield
-    pass
+    checkpoint_task.cancel()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -39,27 +236,35 @@ app = FastAPI(lifespan=lifespan)
 # Search & filter inventory
 
 
-@app.get("/inventory", tags=["Inventory"], response_model=list[Inventory], summary="Search & filter inventory.")
-def get_inv(session: SessionDep,
-            criteria: Annotated[InvListModel, Query()]
-            ) -> list[Inventory]:
-    inv = session.exec(select(Inventory)
-                       .where(criteria.product_id == None or Inventory.product_id == criteria.product_id,
-                              criteria.platform_id == None or Inventory.platform_id == criteria.platform_id,
-                              criteria.min_stock_quantity == None or Inventory.stock_quantity >= criteria.min_stock_quantity,
-                              criteria.max_stock_quantity == None or Inventory.stock_quantity <= criteria.max_stock_quantity)
-                       .offset(criteria.offset)
-                       .limit(criteria.limit)).all()
-    return list(inv)
+@app.get("/inventory", tags=["Inventory"], response_model=list[Inventory], response_model_exclude_none=True, summary="Search & filter inventory.")
+async def get_inv(session: SessionDep,
+                  criteria: Annotated[InvListModel, Query()]
+                  ) -> list[Inventory]:
+    # Build the query by only adding filters for provided criteria, so no
+    # clause is evaluated in Python before reaching the database.
+    stmt = select(Inventory)
+    if criteria.product_id is not None:
+        stmt = stmt.where(Inventory.product_id == criteria.product_id)
+    if criteria.platform_id is not None:
+        stmt = stmt.where(Inventory.platform_id == criteria.platform_id)
+    if criteria.min_stock_quantity is not None:
+        stmt = stmt.where(Inventory.stock_quantity >= criteria.min_stock_quantity)
+    if criteria.max_stock_quantity is not None:
+        stmt = stmt.where(Inventory.stock_quantity <= criteria.max_stock_quantity)
+
+    inv = (await session.exec(stmt
+                              .offset(criteria.offset)
+                              .limit(criteria.limit))).all()
+    return inv
 
 # Get inventory by inventory id.
 
 
 @app.get("/inventory/{inventory_id}", tags=["Inventory"], response_model=Inventory, summary="Get inventory by inventory id.")
-def get_inv_by_id(session: SessionDep,
-                  inventory_id: int) -> Inventory:
+async def get_inv_by_id(session: SessionDep,
+                        inventory_id: int) -> Inventory:
     # Get inventory by provided inventory id
-    inventory = session.get(Inventory, inventory_id)
+    inventory = await session.get(Inventory, inventory_id)
 
     # Riase Not Found error if inventory with provided id isn't found.
     if not inventory:
@@ -71,106 +276,156 @@ def get_inv_by_id(session: SessionDep,
 
 
 @app.post("/inventory/", tags=["Inventory"], response_model=Inventory, summary="Adds or updates inventory item.")
-def update_inv(item: InvUpdateModel,
-               session: SessionDep
-               ) -> Inventory:
-    # Validate product_id
-    prod_count = session.scalar(select(func.count(col(Product.product_id)))
-                                .where(Product.product_id == item.product_id))
-    if not prod_count == 1:
-        raise HTTPException(status_code=404, detail="product_id is not valid.")
-
-    # Validate platform_id
-    platform_count = session.scalar(select(func.count(col(Platform.platform_id)))
-                                    .where(Platform.platform_id == item.platform_id))
-    if not platform_count == 1:
-        raise HTTPException(
-            status_code=404, detail="platform_id is not valid.")
-
-    # Validate stock_quantity
+async def update_inv(item: InvUpdateModel,
+                     session: SessionDep
+                     ) -> Inventory:
+    # Validate product_id and platform_id
+    await validate_ids(session, product_id=item.product_id,
+                       platform_id=item.platform_id)
+
+    # Validate stock_quantity; the CHECK constraint only exists on
+    # databases created from scratch, so keep the cheap guard too.
     if item.stock_quantity < 0:
         raise HTTPException(
             status_code=404, detail="stock_quantity must be zero or more.")
 
-    # Updating inventory
-    inv = session.exec(select(Inventory)
-                       .where(Inventory.platform_id == item.platform_id,
-                              Inventory.product_id == item.product_id)
-                       ).first()
-    if not inv:
-        # raise HTTPException(status_code=404, detail="Inventory data is not valid.")
-        inv = Inventory(
-            product_id=item.product_id,
-            platform_id=item.platform_id,
-            stock_quantity=item.stock_quantity,
-            last_updated=datetime.now()
-        )
-        session.add(inv)
-    else:
-        inv.stock_quantity = item.stock_quantity
-        inv.last_updated = datetime.now()
-
-    session.commit()
-    session.refresh(inv)
+    # Upserting inventory in one statement; the unique
+    # (product_id, platform_id) constraint resolves the conflict. Both
+    # branches stamp last_updated explicitly — the column's server default
+    # is table DDL and doesn't exist on legacy databases.
+    stmt = sqlite_insert(Inventory).values(
+        product_id=item.product_id,
+        platform_id=item.platform_id,
+        stock_quantity=item.stock_quantity,
+        last_updated=func.now()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["product_id", "platform_id"],
+        set_={"stock_quantity": stmt.excluded.stock_quantity,
+              "last_updated": func.now()})
+
+    async with write_lock:
+        try:
+            inv = (await session.scalars(stmt.returning(Inventory))).one()
+        except IntegrityError as e:
+            await session.rollback()
+            raise HTTPException(status_code=422, detail=str(e.orig))
+        await session.commit()
 
     return inv
 
-# Deletes inventory item.
+# Adds or updates inventory items in bulk.
 
 
-@app.delete("/inventory/", tags=["Inventory"], response_model=None, summary="Deletes inventory item.")
-def delete_inv(item: InvDeleteModel,
-               session: SessionDep
-               ) -> None:
-    # Validate product_id
-    prod_count = session.scalar(select(func.count(col(Product.product_id)))
-                                .where(Product.product_id == item.product_id))
-    if not prod_count == 1:
-        raise HTTPException(status_code=404, detail="product_id is not valid.")
+@app.post("/inventory/bulk", tags=["Inventory"], response_model=list[Inventory], summary="Adds or updates inventory items in one transaction.")
+async def update_inv_bulk(items: list[InvUpdateModel],
+                          session: SessionDep
+                          ) -> list[Inventory]:
+    if not items:
+        return []
 
-    # Validate platform_id
-    platform_count = session.scalar(select(func.count(col(Platform.platform_id)))
-                                    .where(Platform.platform_id == item.platform_id))
-    if not platform_count == 1:
+    # Keep only the last entry per (product_id, platform_id); RETURNING
+    # reflects pre-conflict state when one statement upserts the same pair
+    # twice, so earlier duplicates would report stale rows.
+    items = list({(i.product_id, i.platform_id): i for i in items}.values())
+
+    # Validate the whole product and platform id sets with one query each.
+    if await missing_ids(session, Product.product_id,
+                         {i.product_id for i in items}):
+        raise HTTPException(status_code=404, detail="product_id is not valid.")
+    if await missing_ids(session, Platform.platform_id,
+                         {i.platform_id for i in items}):
         raise HTTPException(
             status_code=404, detail="platform_id is not valid.")
 
+    # Validate stock_quantity; the CHECK constraint only exists on
+    # databases created from scratch, so keep the cheap guard too.
+    for item in items:
+        if item.stock_quantity < 0:
+            raise HTTPException(
+                status_code=404, detail="stock_quantity must be zero or more.")
+
+    # One upsert statement executed over all rows. As in update_inv, both
+    # branches stamp last_updated explicitly since the column's server
+    # default doesn't exist on legacy databases.
+    stmt = sqlite_insert(Inventory).values(last_updated=func.now())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["product_id", "platform_id"],
+        set_={"stock_quantity": stmt.excluded.stock_quantity,
+              "last_updated": func.now()})
+
+    async with write_lock:
+        try:
+            inv = (await session.scalars(
+                stmt.returning(Inventory),
+                [item.model_dump() for item in items])).all()
+        except IntegrityError as e:
+            await session.rollback()
+            raise HTTPException(status_code=422, detail=str(e.orig))
+        await session.commit()
+
+    return inv
+
+# Deletes inventory item.
+
+
+@app.delete("/inventory/", tags=["Inventory"], response_model=None, summary="Deletes inventory item.")
+async def delete_inv(item: InvDeleteModel,
+                     session: SessionDep
+                     ) -> None:
+    # Validate product_id and platform_id
+    await validate_ids(session, product_id=item.product_id,
+                       platform_id=item.platform_id)
+
     # Deleting inventory
-    inv = session.exec(select(Inventory)
-                       .where(Inventory.platform_id == item.platform_id,
-                              Inventory.product_id == item.product_id)
-                       ).first()
+    inv = (await session.exec(_INV_BY_PROD_PLAT,
+                              params={"product_id": item.product_id,
+                                      "platform_id": item.platform_id})).first()
     if inv:
-        session.delete(inv)
-        session.commit()
+        async with write_lock:
+            await session.delete(inv)
+            await session.commit()
 
 
 # List all products
-@app.get("/product/", tags=["Product"], response_model=list[Product], summary="Lists all product.")
-def get_prod(session: SessionDep,
-             item: Annotated[ProductListModel, Query()]
-             ) -> list[Product]:
-    # Get all products using criteria, if provided.
-    products = session.exec(select(Product)
-                            .where(item.product_id == None or Product.product_id == item.product_id,
-                                   item.product_name == None or col(
-                                       Product.product_name).contains(item.product_name),
-                                   item.category_id == None or Product.category_id == item.category_id,
-                                   item.brand_id == None or Product.brand_id == item.brand_id)
-                            .offset(item.offset)
-                            .limit(item.limit)
-                            ).all()
-
-    return list(products)
+@app.get("/product/", tags=["Product"], response_model=list[Product], response_model_exclude_none=True, summary="Lists all product.")
+async def get_prod(session: SessionDep,
+                   item: Annotated[ProductListModel, Query()]
+                   ) -> list[Product]:
+    # Build the query by only adding filters for provided criteria, so no
+    # clause is evaluated in Python before reaching the database.
+    stmt = select(Product)
+    if item.product_id is not None:
+        stmt = stmt.where(Product.product_id == item.product_id)
+    if item.product_name is not None:
+        # Token match against the FTS index; the search text is quoted so
+        # user input is never parsed as FTS query syntax.
+        fts_query = '"' + item.product_name.replace('"', '""') + '"'
+        stmt = stmt.where(col(Product.product_id).in_(
+            select(text("rowid"))
+            .select_from(text("product_fts"))
+            .where(text("product_fts MATCH :fts_query"))
+        )).params(fts_query=fts_query)
+    if item.category_id is not None:
+        stmt = stmt.where(Product.category_id == item.category_id)
+    if item.brand_id is not None:
+        stmt = stmt.where(Product.brand_id == item.brand_id)
+
+    products = (await session.exec(stmt
+                                   .offset(item.offset)
+                                   .limit(item.limit)
+                                   )).all()
+
+    return products
 
 # Get product by product id.
 
 
 @app.get("/product/{product_id}", tags=["Product"], response_model=Product, summary="Get product by product id.")
-def get_prod_by_id(session: SessionDep,
-                   product_id: int) -> Product:
+async def get_prod_by_id(session: SessionDep,
+                         product_id: int) -> Product:
     # Get product by provided product id
-    product = session.get(Product, product_id)
+    product = await session.get(Product, product_id)
 
     # Riase Not Found error if product with provided id isn't found.
     if not product:
@@ -182,23 +437,23 @@ def get_prod_by_id(session: SessionDep,
 
 
 @app.post("/product/", tags=["Product"], response_model=Product, summary="Adds a new product.")
-def insert_prod(item: ProductInsertModel,
-                session: SessionDep
-                ) -> Product:
-    # Validate category_id
-    category_count = session.scalar(select(func.count(col(Category.category_id)))
-                                    .where(Category.category_id == item.category_id))
-    if not category_count == 1:
+async def insert_prod(item: ProductInsertModel,
+                      session: SessionDep
+                      ) -> Product:
+    # An explicit null category/brand id is rejected like any unknown id;
+    # validate_ids skips None for callers that don't carry these fields.
+    if item.category_id is None:
         raise HTTPException(
             status_code=404, detail="category_id is not valid.")
-
-    # Validate brand_id
-    brand_count = session.scalar(select(func.count(col(Brand.brand_id)))
-                                 .where(Brand.brand_id == item.brand_id))
-    if not brand_count == 1:
+    if item.brand_id is None:
         raise HTTPException(status_code=404, detail="brand_id is not valid.")
 
-    # Validate product_name
+    # Validate category_id and brand_id
+    await validate_ids(session, category_id=item.category_id,
+                       brand_id=item.brand_id)
+
+    # Validate product_name; the CHECK constraint only exists on
+    # databases created from scratch, so keep the cheap guard too.
     if item.product_name == None or len(item.product_name) <= 0:
         raise HTTPException(
             status_code=404, detail="product_name must not be empty.")
@@ -211,84 +466,136 @@ def insert_prod(item: ProductInsertModel,
     )
 
     session.add(product)
-    session.commit()
-    session.refresh(product)
+    async with write_lock:
+        await commit_or_422(session)
 
     return product
 
+# Add new products in bulk
+
+
+@app.post("/product/bulk", tags=["Product"], response_model=list[Product], summary="Adds multiple products in one transaction.")
+async def insert_prod_bulk(items: list[ProductInsertModel],
+                           session: SessionDep
+                           ) -> list[Product]:
+    if not items:
+        return []
+
+    # Validate category_id and brand_id per row; these are cached set
+    # lookups, so no extra queries are issued. The product_name guard stays
+    # in Python because the CHECK constraint only exists on databases
+    # created from scratch.
+    for item in items:
+        if item.category_id is None:
+            raise HTTPException(
+                status_code=404, detail="category_id is not valid.")
+        if item.brand_id is None:
+            raise HTTPException(
+                status_code=404, detail="brand_id is not valid.")
+        await validate_ids(session, category_id=item.category_id,
+                           brand_id=item.brand_id)
+        if item.product_name == None or len(item.product_name) <= 0:
+            raise HTTPException(
+                status_code=404, detail="product_name must not be empty.")
+
+    # One insert statement executed over all rows.
+    async with write_lock:
+        try:
+            products = (await session.scalars(
+                insert(Product).returning(Product),
+                [item.model_dump() for item in items])).all()
+        except IntegrityError as e:
+            await session.rollback()
+            raise HTTPException(status_code=422, detail=str(e.orig))
+        await session.commit()
+
+    return products
+
 # Updates an existing product
 
 
 @app.put("/product/", tags=["Product"], response_model=Product, summary="Updates an existing product.")
-def update_prod(item: ProductUpdateModel,
-                session: SessionDep
-                ) -> Product:
-    # Validate category_id
-    category_count = session.scalar(select(func.count(col(Category.category_id)))
-                                    .where(Category.category_id == item.category_id))
-    if not category_count == 1:
+async def update_prod(item: ProductUpdateModel,
+                      session: SessionDep
+                      ) -> Product:
+    # An explicit null category/brand id is rejected like any unknown id;
+    # validate_ids skips None for callers that don't carry these fields.
+    if item.category_id is None:
         raise HTTPException(
             status_code=404, detail="category_id is not valid.")
-
-    # Validate brand_id
-    brand_count = session.scalar(select(func.count(col(Brand.brand_id)))
-                                 .where(Brand.brand_id == item.brand_id))
-    if not brand_count == 1:
+    if item.brand_id is None:
         raise HTTPException(status_code=404, detail="brand_id is not valid.")
 
-    # Validate product_name
+    # Validate category_id and brand_id
+    await validate_ids(session, category_id=item.category_id,
+                       brand_id=item.brand_id)
+
+    # Validate product_name; the CHECK constraint only exists on
+    # databases created from scratch, so keep the cheap guard too.
     if item.product_name == None or len(item.product_name) <= 0:
         raise HTTPException(
             status_code=404, detail="product_name must not be empty.")
 
     # Getting existing product data
-    product = session.exec(select(Product)
-                           .where(Product.product_id == item.product_id)
-                           ).one()
+    product = await session.get(Product, item.product_id)
+
+    if not product:
+        raise HTTPException(status_code=404, detail="product_id is not valid.")
 
     product.product_name = item.product_name
     product.category_id = item.category_id
     product.brand_id = item.brand_id
 
-    session.commit()
-    session.refresh(product)
+    async with write_lock:
+        await commit_or_422(session)
 
     return product
 
 # Deletes a product.
 
 
-@app.delete("/product/", tags=["Product"], response_model=None, summary="Deletes a product by product id.")
-def delete_prod(product_id: int,
-                session: SessionDep
-                ) -> None:
+@app.delete("/product/{product_id}", tags=["Product"], response_model=None, summary="Deletes a product by product id.")
+async def delete_prod(product_id: int,
+                      session: SessionDep
+                      ) -> None:
     # Deleting inventory
-    product = session.get(Product, product_id)
+    product = await session.get(Product, product_id)
 
     if product:
-        session.delete(product)
-        session.commit()
+        async with write_lock:
+            await session.delete(product)
+            await session.commit()
     else:
         raise HTTPException(status_code=404, detail="product_id is not valid.")
 
 
 # List all categories
-@app.get("/category/", tags=["Category"], response_model=list[Category], summary="Lists all categories.")
-def get_category(session: SessionDep) -> list[Category]:
-    # Get all categories using criteria, if provided.
-    categories = session.exec(select(Category)).all()
-
-    return list(categories)
+@app.get("/category/", tags=["Category"], response_model=list[Category], response_model_exclude_none=True, summary="Lists all categories.")
+async def get_category(session: SessionDep,
+                       offset: int = 0,
+                       limit: Annotated[int, Query(gt=0, le=100)] = 100
+                       ) -> Response:
+    # SQLite assembles the whole JSON array in one row, so no per-row ORM
+    # objects or Pydantic models are built for this static listing.
+    payload = await session.scalar(
+        text("""SELECT json_group_array(
+                           json_object('category_id', category_id,
+                                       'category_name', category_name))
+                FROM (SELECT category_id, category_name FROM categories
+                      LIMIT :limit OFFSET :offset)"""),
+        {"limit": limit, "offset": offset})
+
+    return Response(content=payload, media_type="application/json")
 
 # Get category by category id
 
 
 @app.get("/category/{category_id}", tags=["Category"], response_model=Category, summary="Get category by category id.")
-def get_category_by_id(session: SessionDep,
-                       category_id: int
-                       ) -> Category:
+async def get_category_by_id(session: SessionDep,
+                             category_id: int
+                             ) -> Category:
     # Get category by provided category id
-    category = session.get(Category, category_id)
+    category = await session.get(Category, category_id)
 
     if not category:
         raise HTTPException(
@@ -300,10 +607,11 @@ def get_category_by_id(session: SessionDep,
 
 
 @app.post("/category/", tags=["Category"], response_model=Category, summary="Add a new category.")
-def add_category(item: CategoryDataModel,
-                 session: SessionDep
-                 ) -> Category:
-    # Validate category_name
+async def add_category(item: CategoryDataModel,
+                       session: SessionDep
+                       ) -> Category:
+    # Validate category_name; the CHECK constraint only exists on
+    # databases created from scratch, so keep the cheap guard too.
     if item.category_name == None or len(item.category_name) <= 0:
         raise HTTPException(
             status_code=404, detail="category_name must not be empty.")
@@ -314,8 +622,9 @@ def add_category(item: CategoryDataModel,
     )
 
     session.add(category)
-    session.commit()
-    session.refresh(category)
+    async with write_lock:
+        await commit_or_422(session)
+    _ref_id_cache.pop(Category.category_id.key, None)
 
     return category
 
@@ -323,17 +632,18 @@ def add_category(item: CategoryDataModel,
 
 
 @app.put("/category/{category_id}", tags=["Category"], response_model=Category, summary="Update a category.")
-def update_category(category_id: int,
-                    item: CategoryDataModel,
-                    session: SessionDep
-                    ) -> Category:
-    # Validate category_name
+async def update_category(category_id: int,
+                          item: CategoryDataModel,
+                          session: SessionDep
+                          ) -> Category:
+    # Validate category_name; the CHECK constraint only exists on
+    # databases created from scratch, so keep the cheap guard too.
     if item.category_name == None or len(item.category_name) <= 0:
         raise HTTPException(
             status_code=404, detail="category_name must not be empty.")
 
     # Getting existing category data
-    category = session.get(Category, category_id)
+    category = await session.get(Category, category_id)
 
     if not category:
         raise HTTPException(
@@ -341,8 +651,8 @@ def update_category(category_id: int,
 
     category.category_name = item.category_name
 
-    session.commit()
-    session.refresh(category)
+    async with write_lock:
+        await commit_or_422(session)
 
     return category
 
@@ -350,37 +660,49 @@ def update_category(category_id: int,
 
 
 @app.delete("/category/{category_id}", tags=["Category"], response_model=None, summary="Delete a category by category id.")
-def delete_category(category_id: int,
-                    session: SessionDep
-                    ) -> None:
+async def delete_category(category_id: int,
+                          session: SessionDep
+                          ) -> None:
     # Deleting category
-    category = session.get(Category, category_id)
+    category = await session.get(Category, category_id)
 
     if category:
-        session.delete(category)
-        session.commit()
+        async with write_lock:
+            await session.delete(category)
+            await session.commit()
+        _ref_id_cache.pop(Category.category_id.key, None)
     else:
         raise HTTPException(
             status_code=404, detail="category_id is not valid.")
 
 
 # List all brands
-@app.get("/brand/", tags=["Brand"], response_model=list[Brand], summary="List all brands.")
-def get_brand(session: SessionDep) -> list[Brand]:
-    # Get all brands using criteria, if provided.
-    brands = session.exec(select(Brand)).all()
-
-    return list(brands)
+@app.get("/brand/", tags=["Brand"], response_model=list[Brand], response_model_exclude_none=True, summary="List all brands.")
+async def get_brand(session: SessionDep,
+                    offset: int = 0,
+                    limit: Annotated[int, Query(gt=0, le=100)] = 100
+                    ) -> Response:
+    # SQLite assembles the whole JSON array in one row, so no per-row ORM
+    # objects or Pydantic models are built for this static listing.
+    payload = await session.scalar(
+        text("""SELECT json_group_array(
+                           json_object('brand_id', brand_id,
+                                       'brand_name', brand_name))
+                FROM (SELECT brand_id, brand_name FROM brands
+                      LIMIT :limit OFFSET :offset)"""),
+        {"limit": limit, "offset": offset})
+
+    return Response(content=payload, media_type="application/json")
 
 # Get brand by brand id
 
 
 @app.get("/brand/{brand_id}", tags=["Brand"], response_model=Brand, summary="Get brand by brand id.")
-def get_brand_by_id(session: SessionDep,
-                    brand_id: int
-                    ) -> Brand:
+async def get_brand_by_id(session: SessionDep,
+                          brand_id: int
+                          ) -> Brand:
     # Get brand by provided brand id
-    brand = session.get(Brand, brand_id)
+    brand = await session.get(Brand, brand_id)
 
     if not brand:
         raise HTTPException(status_code=404, detail="brand_id is not valid.")
@@ -391,10 +713,11 @@ def get_brand_by_id(session: SessionDep,
 
 
 @app.post("/brand/", tags=["Brand"], response_model=Brand, summary="Add a new brand.")
-def add_brand(item: BrandDataModel,
-              session: SessionDep
-              ) -> Brand:
-    # Validate brand_name
+async def add_brand(item: BrandDataModel,
+                    session: SessionDep
+                    ) -> Brand:
+    # Validate brand_name; the CHECK constraint only exists on
+    # databases created from scratch, so keep the cheap guard too.
     if item.brand_name == None or len(item.brand_name) <= 0:
         raise HTTPException(
             status_code=404, detail="brand_name must not be empty.")
@@ -405,8 +728,9 @@ def add_brand(item: BrandDataModel,
     )
 
     session.add(brand)
-    session.commit()
-    session.refresh(brand)
+    async with write_lock:
+        await commit_or_422(session)
+    _ref_id_cache.pop(Brand.brand_id.key, None)
 
     return brand
 
@@ -414,25 +738,26 @@ def add_brand(item: BrandDataModel,
 
 
 @app.put("/brand/{brand_id}", tags=["Brand"], response_model=Brand, summary="Update a brand.")
-def update_brand(brand_id: int,
-                 item: BrandDataModel,
-                 session: SessionDep
-                 ) -> Brand:
-    # Validate brand_name
+async def update_brand(brand_id: int,
+                       item: BrandDataModel,
+                       session: SessionDep
+                       ) -> Brand:
+    # Validate brand_name; the CHECK constraint only exists on
+    # databases created from scratch, so keep the cheap guard too.
     if item.brand_name == None or len(item.brand_name) <= 0:
         raise HTTPException(
             status_code=404, detail="brand_name must not be empty.")
 
     # Getting existing brand data
-    brand = session.get(Brand, brand_id)
+    brand = await session.get(Brand, brand_id)
 
     if not brand:
         raise HTTPException(status_code=404, detail="brand_id is not valid.")
 
     brand.brand_name = item.brand_name
 
-    session.commit()
-    session.refresh(brand)
+    async with write_lock:
+        await commit_or_422(session)
 
     return brand
 
@@ -440,43 +765,51 @@ def update_brand(brand_id: int,
 
 
 @app.delete("/brand/{brand_id}", tags=["Brand"], response_model=None, summary="Delete a brand by brand id.")
-def delete_brand(brand_id: int,
-                 session: SessionDep
-                 ) -> None:
+async def delete_brand(brand_id: int,
+                       session: SessionDep
+                       ) -> None:
     # Deleting brand
-    brand = session.get(Brand, brand_id)
+    brand = await session.get(Brand, brand_id)
 
     if brand:
-        session.delete(brand)
-        session.commit()
+        async with write_lock:
+            await session.delete(brand)
+            await session.commit()
+        _ref_id_cache.pop(Brand.brand_id.key, None)
     else:
         raise HTTPException(status_code=404, detail="brand_id is not valid.")
 
 
 # List all sales
-@app.get("/sales/", tags=["Sale"], response_model=list[Sale], summary="List all sales.")
-def get_sales(session: SessionDep,
-              criteria: Annotated[SalesListModel, Query()]
-              ) -> list[Sale]:
-    # Get all sales using criteria, if provided.
-    sales = session.exec(select(Sale)
-                         .where(criteria.product_id is None or criteria.product_id == Sale.product_id,
-                                criteria.platform_id is None or criteria.platform_id == Sale.platform_id,
-                                criteria.sale_date is None or criteria.sale_date == Sale.sale_date)
-                         .offset(criteria.offset)
-                         .limit(criteria.limit)).all()
-
-    return list(sales)
+@app.get("/sales/", tags=["Sale"], response_model=list[Sale], response_model_exclude_none=True, summary="List all sales.")
+async def get_sales(session: SessionDep,
+                    criteria: Annotated[SalesListModel, Query()]
+                    ) -> list[Sale]:
+    # Build the query by only adding filters for provided criteria, so no
+    # clause is evaluated in Python before reaching the database.
+    stmt = select(Sale)
+    if criteria.product_id is not None:
+        stmt = stmt.where(Sale.product_id == criteria.product_id)
+    if criteria.platform_id is not None:
+        stmt = stmt.where(Sale.platform_id == criteria.platform_id)
+    if criteria.sale_date is not None:
+        stmt = stmt.where(Sale.sale_date == criteria.sale_date)
+
+    sales = (await session.exec(stmt
+                                .offset(criteria.offset)
+                                .limit(criteria.limit))).all()
+
+    return sales
 
 # Get sale by sale id
 
 
 @app.get("/sale/{sale_id}", tags=["Sale"], response_model=Sale, summary="Get sale by sale id.")
-def get_sale_by_id(session: SessionDep,
-                   sale_id: int
-                   ) -> Sale:
+async def get_sale_by_id(session: SessionDep,
+                         sale_id: int
+                         ) -> Sale:
     # Get sale by provided sale id
-    sale = session.get(Sale, sale_id)
+    sale = await session.get(Sale, sale_id)
 
     if not sale:
         raise HTTPException(status_code=404, detail="sale_id is not valid.")
@@ -487,21 +820,12 @@ def get_sale_by_id(session: SessionDep,
 
 
 @app.post("/sale/", tags=["Sale"], response_model=Sale, summary="Add a new sale.")
-def add_sale(item: SalesDataModel,
-             session: SessionDep
-             ) -> Sale:
-   # Validate product_id
-    prod_count = session.scalar(select(func.count(col(Product.product_id)))
-                                .where(Product.product_id == item.product_id))
-    if not prod_count == 1:
-        raise HTTPException(status_code=404, detail="product_id is not valid.")
-
-    # Validate platform_id
-    platform_count = session.scalar(select(func.count(col(Platform.platform_id)))
-                                    .where(Platform.platform_id == item.platform_id))
-    if not platform_count == 1:
-        raise HTTPException(
-            status_code=404, detail="platform_id is not valid.")
+async def add_sale(item: SalesDataModel,
+                   session: SessionDep
+                   ) -> Sale:
+    # Validate product_id and platform_id
+    await validate_ids(session, product_id=item.product_id,
+                       platform_id=item.platform_id)
 
     # Validate quantity_sold
     if item.quantity_sold <= 0:
@@ -523,32 +847,66 @@ def add_sale(item: SalesDataModel,
     )
 
     session.add(sale)
-    session.commit()
-    session.refresh(sale)
+    async with write_lock:
+        await session.commit()
 
     return sale
 
-# Update a sale
+# Add new sales in bulk
 
 
-@app.put("/sale/{sale_id}", tags=["Sale"], response_model=Sale, summary="Update a sale.")
-def update_sale(sale_id: int,
-                item: SalesDataModel,
-                session: SessionDep
-                ) -> Sale:
-   # Validate product_id
-    prod_count = session.scalar(select(func.count(col(Product.product_id)))
-                                .where(Product.product_id == item.product_id))
-    if not prod_count == 1:
-        raise HTTPException(status_code=404, detail="product_id is not valid.")
+@app.post("/sale/bulk", tags=["Sale"], response_model=list[Sale], summary="Adds multiple sales in one transaction.")
+async def add_sale_bulk(items: list[SalesDataModel],
+                        session: SessionDep
+                        ) -> list[Sale]:
+    if not items:
+        return []
 
-    # Validate platform_id
-    platform_count = session.scalar(select(func.count(col(Platform.platform_id)))
-                                    .where(Platform.platform_id == item.platform_id))
-    if not platform_count == 1:
+    # Validate the whole product and platform id sets with one query each.
+    if await missing_ids(session, Product.product_id,
+                         {i.product_id for i in items}):
+        raise HTTPException(status_code=404, detail="product_id is not valid.")
+    if await missing_ids(session, Platform.platform_id,
+                         {i.platform_id for i in items}):
         raise HTTPException(
             status_code=404, detail="platform_id is not valid.")
 
+    for item in items:
+        # Validate quantity_sold
+        if item.quantity_sold <= 0:
+            raise HTTPException(
+                status_code=404, detail="quantity_sold must be greater than zero.")
+
+        # Validate sale_price
+        if item.sale_price < 0:
+            raise HTTPException(
+                status_code=404, detail="sale_price can not be a negitive number.")
+
+    # One insert statement executed over all rows.
+    async with write_lock:
+        try:
+            sales = (await session.scalars(
+                insert(Sale).returning(Sale),
+                [item.model_dump() for item in items])).all()
+        except IntegrityError as e:
+            await session.rollback()
+            raise HTTPException(status_code=422, detail=str(e.orig))
+        await session.commit()
+
+    return sales
+
+# Update a sale
+
+
+@app.put("/sale/{sale_id}", tags=["Sale"], response_model=Sale, summary="Update a sale.")
+async def update_sale(sale_id: int,
+                      item: SalesDataModel,
+                      session: SessionDep
+                      ) -> Sale:
+    # Validate product_id and platform_id
+    await validate_ids(session, product_id=item.product_id,
+                       platform_id=item.platform_id)
+
     # Validate quantity_sold
     if item.quantity_sold <= 0:
         raise HTTPException(
@@ -560,7 +918,7 @@ def update_sale(sale_id: int,
             status_code=404, detail="sale_price can not be a negitive number.")
 
     # Getting existing sale data
-    sale = session.get(Sale, sale_id)
+    sale = await session.get(Sale, sale_id)
 
     if not sale:
         raise HTTPException(status_code=404, detail="sale_id is not valid.")
@@ -571,8 +929,8 @@ def update_sale(sale_id: int,
     sale.quantity_sold = item.quantity_sold
     sale.sale_price = item.sale_price
 
-    session.commit()
-    session.refresh(sale)
+    async with write_lock:
+        await session.commit()
 
     return sale
 
@@ -580,14 +938,15 @@ def update_sale(sale_id: int,
 
 
 @app.delete("/sale/{sale_id}", tags=["Sale"], response_model=None, summary="Delete a sale by sale id.")
-def delete_sale(sale_id: int,
-                session: SessionDep
-                ) -> None:
+async def delete_sale(sale_id: int,
+                      session: SessionDep
+                      ) -> None:
     # Deleting sale
-    sale = session.get(Sale, sale_id)
+    sale = await session.get(Sale, sale_id)
 
     if sale:
-        session.delete(sale)
-        session.commit()
+        async with write_lock:
+            await session.delete(sale)
+            await session.commit()
     else:
         raise HTTPException(status_code=404, detail="sale_id is not valid.")